@@ -88,12 +88,12 @@ st.subheader("Revenue Trend Over Time")
 
 query_trend = """
 SELECT
-    DATE_TRUNC('month', order_date) as month,
-    SUM(sale_price) as revenue,
+    MAKE_DATE(year::int, month::int, 1)::timestamp as month,
+    SUM(revenue) as revenue,
     SUM(profit) as profit
-FROM orders
-GROUP BY DATE_TRUNC('month', order_date)
-ORDER BY month
+FROM orders_rollup
+GROUP BY year, month
+ORDER BY year, month
 """
 
 df_trend = run_query(query_trend)
@@ -104,9 +104,11 @@ if not df_trend.empty:
         x='month',
         y='revenue',
         title='Monthly Revenue Trend',
-        labels={'month': 'Month', 'revenue': 'Revenue ($)'}
+        labels={'month': 'Month', 'revenue': 'Revenue ($)'},
+        render_mode='webgl'
     )
     fig.update_traces(line_color='#1f77b4', line_width=3)
+    fig.update_layout(hovermode='x unified')
     st.plotly_chart(fig, use_container_width=True)
 else:
     st.info("Connect to database to view revenue trends.")
@@ -147,12 +149,21 @@ with col1:
 with col2:
     st.subheader("Sales by Region")
 
+    # Keep the pie to at most 11 slices: top 10 regions plus an 'Other' bucket
     query_region = """
+    WITH ranked AS (
+        SELECT
+            region,
+            SUM(revenue) as revenue,
+            ROW_NUMBER() OVER (ORDER BY SUM(revenue) DESC) as rn
+        FROM orders_rollup
+        GROUP BY region
+    )
     SELECT
-        region,
-        SUM(sale_price) as revenue
-    FROM orders
-    GROUP BY region
+        CASE WHEN rn <= 10 THEN region ELSE 'Other' END as region,
+        SUM(revenue) as revenue
+    FROM ranked
+    GROUP BY 1
     ORDER BY revenue DESC
     """
 
@@ -2,9 +2,10 @@
 # ABOUTME: Displays year-over-year comparisons and segment analysis.
 
 import streamlit as st
+import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-from utils.database import run_query, get_summary_stats
+from utils.database import run_query, get_summary_stats, get_overview_rollup, get_years
 
 st.set_page_config(page_title="Executive Overview", page_icon="📊", layout="wide")
 
@@ -15,26 +16,32 @@ st.divider()
 # Year selector
 col1, col2 = st.columns([1, 3])
 with col1:
-    year_query = "SELECT DISTINCT year FROM orders ORDER BY year"
-    years_df = run_query(year_query)
-    if not years_df.empty:
-        selected_year = st.selectbox("Select Year", years_df['year'].tolist(), index=len(years_df)-1)
+    years = get_years()
+    if years:
+        selected_year = st.selectbox("Select Year", years, index=len(years)-1)
     else:
         selected_year = 2023
 
+# Yearly and segment metrics share one GROUPING SETS query
+df_overview = get_overview_rollup()
+
+if not df_overview.empty:
+    df_yoy = (
+        df_overview.query("level == 'year'")
+        .astype({'year': int})
+        .sort_values('year')[['year', 'revenue', 'profit', 'orders', 'avg_margin', 'avg_order_value']]
+    )
+    df_segment = (
+        df_overview.query("level == 'segment'")
+        .sort_values('revenue', ascending=False)[['segment', 'orders', 'revenue', 'profit', 'avg_margin']]
+        .reset_index(drop=True)
+    )
+else:
+    df_yoy = pd.DataFrame()
+    df_segment = pd.DataFrame()
+
 # KPIs for selected year
-query_year_kpis = f"""
-SELECT
-    COUNT(*) as orders,
-    SUM(sale_price) as revenue,
-    SUM(profit) as profit,
-    AVG(profit_margin) as avg_margin,
-    AVG(sale_price) as avg_order_value
-FROM orders
-WHERE year = {selected_year}
-"""
-
-df_kpis = run_query(query_year_kpis)
+df_kpis = df_yoy[df_yoy['year'] == selected_year] if not df_yoy.empty else df_yoy
 
 if not df_kpis.empty:
     kpis = df_kpis.iloc[0]
@@ -51,20 +58,6 @@ st.divider()
 # Year-over-Year Comparison
 st.subheader("Year-over-Year Performance")
 
-query_yoy = """
-SELECT
-    year,
-    SUM(sale_price) as revenue,
-    SUM(profit) as profit,
-    COUNT(*) as orders,
-    AVG(profit_margin) as avg_margin
-FROM orders
-GROUP BY year
-ORDER BY year
-"""
-
-df_yoy = run_query(query_yoy)
-
 if not df_yoy.empty:
     col1, col2 = st.columns(2)
 
@@ -84,8 +77,8 @@ if not df_yoy.empty:
         query_subcats = """
         SELECT
             sub_category,
-            SUM(sale_price) as revenue
-        FROM orders
+            SUM(revenue) as revenue
+        FROM orders_rollup
         GROUP BY sub_category
         ORDER BY revenue DESC
         LIMIT 10
@@ -108,20 +101,6 @@ if not df_yoy.empty:
 # Segment Analysis
 st.subheader("Customer Segment Analysis")
 
-query_segment = """
-SELECT
-    segment,
-    COUNT(*) as orders,
-    SUM(sale_price) as revenue,
-    SUM(profit) as profit,
-    AVG(profit_margin) as avg_margin
-FROM orders
-GROUP BY segment
-ORDER BY revenue DESC
-"""
-
-df_segment = run_query(query_segment)
-
 if not df_segment.empty:
     col1, col2 = st.columns(2)
 
@@ -145,7 +124,7 @@ if not df_segment.empty:
                 ELSE '>20%'
             END as discount_tier,
             COUNT(*) as orders,
-            ROUND(AVG(profit_margin)::numeric, 2) as avg_margin
+            AVG(profit_margin) as avg_margin
         FROM orders
         GROUP BY discount_tier
         ORDER BY avg_margin DESC
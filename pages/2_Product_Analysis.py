@@ -39,38 +39,46 @@ with st.sidebar:
     else:
         date_filter = None
 
-# Build filter clause
+# Build filter clause - values are bound as query parameters, sorted so the
+# same selection always produces the same cache key
+filters = []
+filter_params = {}
+
 if selected_categories:
-    categories_str = "','".join(selected_categories)
-    category_filter = f"category IN ('{categories_str}')"
-else:
-    category_filter = "1=1"
+    filters.append("category = ANY(%(categories)s)")
+    filter_params['categories'] = sorted(selected_categories)
 
 if date_filter and len(date_filter) == 2:
-    date_clause = f"order_date BETWEEN '{date_filter[0]}' AND '{date_filter[1]}'"
-else:
-    date_clause = "1=1"
-
-# Category Performance
-st.subheader("Category Performance Comparison")
-
-query_category = f"""
-SELECT
-    category,
-    COUNT(DISTINCT order_id) as orders,
-    SUM(quantity) as units_sold,
-    ROUND(SUM(sale_price)::numeric, 2) as revenue,
-    ROUND(SUM(profit)::numeric, 2) as profit,
-    ROUND(AVG(profit_margin)::numeric, 2) as avg_margin
-FROM orders
-WHERE {category_filter} AND {date_clause}
-GROUP BY category
-ORDER BY revenue DESC
-"""
-
-df_category = run_query(query_category)
-
-if not df_category.empty:
+    filters.append("order_date BETWEEN %(start_date)s AND %(end_date)s")
+    filter_params['start_date'], filter_params['end_date'] = date_filter
+
+where_clause = " AND ".join(filters) or "1=1"
+
+
+@st.fragment
+def render_category_performance(where_clause: str, filter_params: dict):
+    """Render category comparison charts, table, and CSV download."""
+    st.subheader("Category Performance Comparison")
+
+    query_category = f"""
+    SELECT
+        category,
+        COUNT(DISTINCT order_id) as orders,
+        SUM(quantity) as units_sold,
+        SUM(sale_price) as revenue,
+        SUM(profit) as profit,
+        AVG(profit_margin) as avg_margin
+    FROM orders
+    WHERE {where_clause}
+    GROUP BY category
+    ORDER BY revenue DESC
+    """
+
+    df_category = run_query(query_category, filter_params).round(2)
+
+    if df_category.empty:
+        return
+
     col1, col2 = st.columns(2)
 
     with col1:
@@ -117,80 +125,108 @@ if not df_category.empty:
     st.subheader("Detailed Category Data")
     st.dataframe(df_category, use_container_width=True)
 
-    csv = df_category.to_csv(index=False)
+    # Serialized only when the button is clicked, not on every rerun
     st.download_button(
         label="Download CSV",
-        data=csv,
+        data=lambda: df_category.to_csv(index=False),
         file_name="category_analysis.csv",
         mime="text/csv"
     )
 
-st.divider()
 
-# Top/Bottom performers
-col1, col2 = st.columns(2)
-
-with col1:
-    st.subheader("Top 10 Products by Revenue")
-    query_top = f"""
-    SELECT product_id, category, sub_category,
-           ROUND(SUM(sale_price)::numeric, 2) as revenue,
-           ROUND(AVG(profit_margin)::numeric, 2) as margin
+@st.fragment
+def render_top_bottom_products(where_clause: str, filter_params: dict):
+    """Render the top and bottom 10 products by revenue side by side."""
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.subheader("Top 10 Products by Revenue")
+        query_top = f"""
+        SELECT product_id, category, sub_category,
+               SUM(sale_price) as revenue,
+               AVG(profit_margin) as margin
+        FROM orders
+        WHERE {where_clause}
+        GROUP BY product_id, category, sub_category
+        ORDER BY revenue DESC
+        LIMIT 10
+        """
+        df_top = run_query(query_top, filter_params).round(2)
+        if not df_top.empty:
+            st.dataframe(df_top, use_container_width=True)
+
+    with col2:
+        st.subheader("Bottom 10 Products by Revenue")
+        query_bottom = f"""
+        SELECT product_id, category, sub_category,
+               SUM(sale_price) as revenue,
+               AVG(profit_margin) as margin
+        FROM orders
+        WHERE {where_clause}
+        GROUP BY product_id, category, sub_category
+        ORDER BY revenue ASC
+        LIMIT 10
+        """
+        df_bottom = run_query(query_bottom, filter_params).round(2)
+        if not df_bottom.empty:
+            st.dataframe(df_bottom, use_container_width=True)
+
+
+@st.fragment
+def render_subcategory_treemap(where_clause: str, filter_params: dict):
+    """Render the category / sub-category revenue treemap."""
+    st.subheader("Sub-Category Performance")
+
+    # Category totals and sub-category leaves come pre-aggregated from one
+    # GROUPING SETS query as treemap ids/parents, so Plotly does no grouping
+    query_subcat = f"""
+    SELECT
+        CASE WHEN GROUPING(sub_category) = 1 THEN category
+             ELSE category || '/' || sub_category END as id,
+        CASE WHEN GROUPING(sub_category) = 1 THEN category
+             ELSE sub_category END as label,
+        CASE WHEN GROUPING(sub_category) = 1 THEN ''
+             ELSE category END as parent,
+        COUNT(*) as orders,
+        SUM(sale_price) as revenue,
+        AVG(profit_margin) as avg_margin
     FROM orders
-    WHERE {category_filter} AND {date_clause}
-    GROUP BY product_id, category, sub_category
+    WHERE {where_clause}
+    GROUP BY GROUPING SETS ((category), (category, sub_category))
     ORDER BY revenue DESC
-    LIMIT 10
-    """
-    df_top = run_query(query_top)
-    if not df_top.empty:
-        st.dataframe(df_top, use_container_width=True)
-
-with col2:
-    st.subheader("Bottom 10 Products by Revenue")
-    query_bottom = f"""
-    SELECT product_id, category, sub_category,
-           ROUND(SUM(sale_price)::numeric, 2) as revenue,
-           ROUND(AVG(profit_margin)::numeric, 2) as margin
-    FROM orders
-    WHERE {category_filter} AND {date_clause}
-    GROUP BY product_id, category, sub_category
-    ORDER BY revenue ASC
-    LIMIT 10
     """
-    df_bottom = run_query(query_bottom)
-    if not df_bottom.empty:
-        st.dataframe(df_bottom, use_container_width=True)
+
+    df_subcat = run_query(query_subcat, filter_params)
+
+    if not df_subcat.empty:
+        fig = go.Figure(go.Treemap(
+            ids=df_subcat['id'],
+            labels=df_subcat['label'],
+            parents=df_subcat['parent'],
+            values=df_subcat['revenue'],
+            branchvalues='total',
+            marker=dict(
+                colors=df_subcat['avg_margin'],
+                colorscale='RdYlGn',
+                showscale=True,
+                colorbar=dict(title='avg_margin')
+            )
+        ))
+        fig.update_layout(title='Revenue by Category and Sub-Category (color = profit margin)')
+        st.plotly_chart(fig, use_container_width=True)
+
+
+# Each section is a fragment, so interacting with it reruns only that section
+render_category_performance(where_clause, filter_params)
+
+st.divider()
+
+# Top/Bottom performers
+render_top_bottom_products(where_clause, filter_params)
 
 # Sub-category analysis
 st.divider()
-st.subheader("Sub-Category Performance")
-
-query_subcat = f"""
-SELECT
-    category,
-    sub_category,
-    COUNT(*) as orders,
-    ROUND(SUM(sale_price)::numeric, 2) as revenue,
-    ROUND(AVG(profit_margin)::numeric, 2) as avg_margin
-FROM orders
-WHERE {category_filter} AND {date_clause}
-GROUP BY category, sub_category
-ORDER BY revenue DESC
-"""
-
-df_subcat = run_query(query_subcat)
-
-if not df_subcat.empty:
-    fig = px.treemap(
-        df_subcat,
-        path=['category', 'sub_category'],
-        values='revenue',
-        color='avg_margin',
-        color_continuous_scale='RdYlGn',
-        title='Revenue by Category and Sub-Category (color = profit margin)'
-    )
-    st.plotly_chart(fig, use_container_width=True)
+render_subcategory_treemap(where_clause, filter_params)
 
 # Insights
 st.info("""
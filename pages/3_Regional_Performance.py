@@ -26,33 +26,40 @@ with st.sidebar:
         selected_regions = []
         st.info("Connect to database to load regions")
 
-# Build filter
+# Build filter - regions are bound as a query parameter, sorted so the same
+# selection always produces the same cache key
 if selected_regions:
-    regions_str = "','".join(selected_regions)
-    region_filter = f"region IN ('{regions_str}')"
+    region_filter = "region = ANY(%(regions)s)"
+    filter_params = {'regions': sorted(selected_regions)}
 else:
     region_filter = "1=1"
+    filter_params = {}
+
+
+@st.fragment
+def render_region_overview(region_filter: str, filter_params: dict):
+    """Render regional revenue charts, KPI cards, and CSV download."""
+    st.subheader("Regional Performance Overview")
+
+    query_region = f"""
+    SELECT
+        region,
+        SUM(orders) as orders,
+        SUM(revenue) as revenue,
+        SUM(profit) as profit,
+        SUM(margin_sum) / NULLIF(SUM(margin_count), 0) as avg_margin,
+        SUM(revenue) / SUM(SUM(revenue)) OVER () * 100 as revenue_share
+    FROM orders_rollup
+    WHERE {region_filter}
+    GROUP BY region
+    ORDER BY revenue DESC
+    """
+
+    df_region = run_query(query_region, filter_params).round(2)
+
+    if df_region.empty:
+        return
 
-# Regional Overview
-st.subheader("Regional Performance Overview")
-
-query_region = f"""
-SELECT
-    region,
-    COUNT(DISTINCT order_id) as orders,
-    ROUND(SUM(sale_price)::numeric, 2) as revenue,
-    ROUND(SUM(profit)::numeric, 2) as profit,
-    ROUND(AVG(profit_margin)::numeric, 2) as avg_margin,
-    ROUND((SUM(sale_price) / SUM(SUM(sale_price)) OVER () * 100)::numeric, 2) as revenue_share
-FROM orders
-WHERE {region_filter}
-GROUP BY region
-ORDER BY revenue DESC
-"""
-
-df_region = run_query(query_region)
-
-if not df_region.empty:
     col1, col2 = st.columns(2)
 
     with col1:
@@ -83,113 +90,132 @@ if not df_region.empty:
             st.metric(row['region'], f"${row['revenue']:,.0f}")
             st.caption(f"Margin: {row['avg_margin']:.1f}%")
 
+    # Download
+    st.download_button(
+        label="Download Regional Data",
+        data=lambda: df_region.to_csv(index=False),
+        file_name="regional_performance.csv",
+        mime="text/csv"
+    )
+
+
+@st.fragment
+def render_state_performance(region_filter: str, filter_params: dict):
+    """Render the top 15 states chart and table."""
+    st.subheader("Top Performing States")
+
+    query_state = f"""
+    SELECT
+        state,
+        region,
+        COUNT(*) as orders,
+        SUM(sale_price) as revenue,
+        SUM(profit) as profit,
+        AVG(profit_margin) as avg_margin
+    FROM orders
+    WHERE {region_filter}
+    GROUP BY state, region
+    HAVING COUNT(*) >= 20
+    ORDER BY revenue DESC
+    LIMIT 15
+    """
+
+    df_state = run_query(query_state, filter_params).round(2)
+
+    if not df_state.empty:
+        fig = px.bar(
+            df_state,
+            x='state',
+            y='revenue',
+            color='region',
+            title='Top 15 States by Revenue',
+            labels={'revenue': 'Revenue ($)'}
+        )
+        fig.update_layout(xaxis_tickangle=-45)
+        st.plotly_chart(fig, use_container_width=True)
+
+        # State data table
+        st.dataframe(df_state, use_container_width=True)
+
+
+@st.fragment
+def render_shipping_performance(region_filter: str, filter_params: dict):
+    """Render order distribution by ship mode and region."""
+    st.subheader("Shipping Mode Performance by Region")
+
+    query_shipping = f"""
+    SELECT
+        region,
+        COALESCE(ship_mode, 'Unknown') as ship_mode,
+        COUNT(*) as orders,
+        SUM(sale_price) as revenue,
+        AVG(profit_margin) as avg_margin
+    FROM orders
+    WHERE {region_filter}
+    GROUP BY region, ship_mode
+    ORDER BY region, revenue DESC
+    """
+
+    df_shipping = run_query(query_shipping, filter_params)
+
+    if not df_shipping.empty:
+        fig = px.bar(
+            df_shipping,
+            x='region',
+            y='orders',
+            color='ship_mode',
+            title='Order Distribution by Ship Mode and Region',
+            barmode='stack'
+        )
+        st.plotly_chart(fig, use_container_width=True)
+
+
+@st.fragment
+def render_top_cities(region_filter: str, filter_params: dict):
+    """Render the top 10 cities by revenue."""
+    st.subheader("Top Cities by Revenue")
+
+    query_city = f"""
+    SELECT
+        city,
+        state,
+        region,
+        COUNT(*) as orders,
+        SUM(sale_price) as revenue
+    FROM orders
+    WHERE {region_filter}
+    GROUP BY city, state, region
+    ORDER BY revenue DESC
+    LIMIT 10
+    """
+
+    df_city = run_query(query_city, filter_params).round(2)
+
+    if not df_city.empty:
+        fig = px.bar(
+            df_city,
+            x='revenue',
+            y='city',
+            color='region',
+            orientation='h',
+            title='Top 10 Cities by Revenue'
+        )
+        fig.update_layout(yaxis={'categoryorder': 'total ascending'})
+        st.plotly_chart(fig, use_container_width=True)
+
+
+render_region_overview(region_filter, filter_params)
+
 st.divider()
 
 # State-level analysis
-st.subheader("Top Performing States")
-
-query_state = f"""
-SELECT
-    state,
-    region,
-    COUNT(*) as orders,
-    ROUND(SUM(sale_price)::numeric, 2) as revenue,
-    ROUND(SUM(profit)::numeric, 2) as profit,
-    ROUND(AVG(profit_margin)::numeric, 2) as avg_margin
-FROM orders
-WHERE {region_filter}
-GROUP BY state, region
-HAVING COUNT(*) >= 20
-ORDER BY revenue DESC
-LIMIT 15
-"""
-
-df_state = run_query(query_state)
-
-if not df_state.empty:
-    fig = px.bar(
-        df_state,
-        x='state',
-        y='revenue',
-        color='region',
-        title='Top 15 States by Revenue',
-        labels={'revenue': 'Revenue ($)'}
-    )
-    fig.update_layout(xaxis_tickangle=-45)
-    st.plotly_chart(fig, use_container_width=True)
-
-    # State data table
-    st.dataframe(df_state, use_container_width=True)
+render_state_performance(region_filter, filter_params)
 
 st.divider()
 
 # Shipping Mode Analysis
-st.subheader("Shipping Mode Performance by Region")
-
-query_shipping = f"""
-SELECT
-    region,
-    COALESCE(ship_mode, 'Unknown') as ship_mode,
-    COUNT(*) as orders,
-    ROUND(SUM(sale_price)::numeric, 2) as revenue,
-    ROUND(AVG(profit_margin)::numeric, 2) as avg_margin
-FROM orders
-WHERE {region_filter}
-GROUP BY region, ship_mode
-ORDER BY region, revenue DESC
-"""
-
-df_shipping = run_query(query_shipping)
-
-if not df_shipping.empty:
-    fig = px.bar(
-        df_shipping,
-        x='region',
-        y='orders',
-        color='ship_mode',
-        title='Order Distribution by Ship Mode and Region',
-        barmode='stack'
-    )
-    st.plotly_chart(fig, use_container_width=True)
+render_shipping_performance(region_filter, filter_params)
 
 # City analysis
 st.divider()
-st.subheader("Top Cities by Revenue")
-
-query_city = f"""
-SELECT
-    city,
-    state,
-    region,
-    COUNT(*) as orders,
-    ROUND(SUM(sale_price)::numeric, 2) as revenue
-FROM orders
-WHERE {region_filter}
-GROUP BY city, state, region
-ORDER BY revenue DESC
-LIMIT 10
-"""
-
-df_city = run_query(query_city)
-
-if not df_city.empty:
-    fig = px.bar(
-        df_city,
-        x='revenue',
-        y='city',
-        color='region',
-        orientation='h',
-        title='Top 10 Cities by Revenue'
-    )
-    fig.update_layout(yaxis={'categoryorder': 'total ascending'})
-    st.plotly_chart(fig, use_container_width=True)
-
-# Download
-if not df_region.empty:
-    csv = df_region.to_csv(index=False)
-    st.download_button(
-        label="Download Regional Data",
-        data=csv,
-        file_name="regional_performance.csv",
-        mime="text/csv"
-    )
+render_top_cities(region_filter, filter_params)
@@ -1,6 +1,7 @@
 # ABOUTME: Time series analysis page showing trends and seasonality.
 # ABOUTME: Displays monthly trends, quarterly comparisons, and growth metrics.
 
+import calendar
 import streamlit as st
 import plotly.express as px
 import plotly.graph_objects as go
@@ -29,16 +30,20 @@ with st.sidebar:
         ["Revenue", "Profit", "Orders"]
     )
 
-# Build filter
+# Build filter - the category is bound as a query parameter
 if selected_category != "All Categories":
-    category_filter = f"category = '{selected_category}'"
+    category_filter = "category = %(category)s"
+    filter_params = {'category': selected_category}
 else:
     category_filter = "1=1"
+    filter_params = {}
 
+# Trend queries aggregate the orders_rollup materialized view, which holds
+# one pre-summed row per month and dimension combination
 metric_map = {
-    "Revenue": "SUM(sale_price)",
+    "Revenue": "SUM(revenue)",
     "Profit": "SUM(profit)",
-    "Orders": "COUNT(*)"
+    "Orders": "SUM(orders)"
 }
 metric_col = metric_map[metric_choice]
 
@@ -50,27 +55,28 @@ SELECT
     year,
     month,
     month_name,
-    {metric_col} as value
-FROM orders
+    {metric_col} as value,
+    TO_CHAR(MAKE_DATE(year::int, month::int, 1), 'YYYY-MM') as period
+FROM orders_rollup
 WHERE {category_filter}
 GROUP BY year, month, month_name
 ORDER BY year, month
 """
 
-df_monthly = run_query(query_monthly)
+df_monthly = run_query(query_monthly, filter_params)
 
 if not df_monthly.empty:
-    df_monthly['period'] = df_monthly['year'].astype(str) + '-' + df_monthly['month'].astype(str).str.zfill(2)
-
     fig = px.line(
         df_monthly,
         x='period',
         y='value',
         title=f'Monthly {metric_choice}',
         labels={'period': 'Month', 'value': metric_choice},
-        markers=True
+        markers=True,
+        render_mode='webgl'
     )
     fig.update_traces(line_width=2)
+    fig.update_layout(hovermode='x unified')
     st.plotly_chart(fig, use_container_width=True)
 
 st.divider()
@@ -81,29 +87,31 @@ st.subheader("Year-over-Year Comparison by Month")
 query_yoy_month = f"""
 SELECT
     month,
-    month_name,
     year,
     {metric_col} as value
-FROM orders
+FROM orders_rollup
 WHERE {category_filter}
-GROUP BY month, month_name, year
+GROUP BY month, year
 ORDER BY month, year
 """
 
-df_yoy_month = run_query(query_yoy_month)
+df_yoy_month = run_query(query_yoy_month, filter_params)
 
 if not df_yoy_month.empty:
     fig = px.bar(
         df_yoy_month,
-        x='month_name',
+        x='month',
         y='value',
         color='year',
         barmode='group',
         title=f'{metric_choice} by Month (Year Comparison)',
-        labels={'value': metric_choice, 'month_name': 'Month'},
-        category_orders={'month_name': ['January', 'February', 'March', 'April',
-                                         'May', 'June', 'July', 'August',
-                                         'September', 'October', 'November', 'December']}
+        labels={'value': metric_choice, 'month': 'Month'}
+    )
+    # Numeric month axis labelled with month names, so no categorical reordering
+    fig.update_xaxes(
+        tickmode='array',
+        tickvals=list(range(1, 13)),
+        ticktext=[calendar.month_abbr[m] for m in range(1, 13)]
     )
     st.plotly_chart(fig, use_container_width=True)
 
@@ -116,19 +124,18 @@ SELECT
     year,
     quarter,
     {metric_col} as value,
-    COUNT(DISTINCT order_id) as orders,
-    ROUND(AVG(profit_margin)::numeric, 2) as avg_margin
-FROM orders
+    SUM(orders) as orders,
+    SUM(margin_sum) / NULLIF(SUM(margin_count), 0) as avg_margin,
+    'Q' || quarter || ' ' || year as quarter_label
+FROM orders_rollup
 WHERE {category_filter}
 GROUP BY year, quarter
 ORDER BY year, quarter
 """
 
-df_quarterly = run_query(query_quarterly)
+df_quarterly = run_query(query_quarterly, filter_params).round(2)
 
 if not df_quarterly.empty:
-    df_quarterly['quarter_label'] = 'Q' + df_quarterly['quarter'].astype(str) + ' ' + df_quarterly['year'].astype(str)
-
     col1, col2 = st.columns(2)
 
     with col1:
@@ -149,9 +156,11 @@ if not df_quarterly.empty:
             y='avg_margin',
             title='Quarterly Profit Margin Trend',
             labels={'avg_margin': 'Profit Margin (%)', 'quarter_label': 'Quarter'},
-            markers=True
+            markers=True,
+            render_mode='webgl'
         )
         fig.update_traces(line_color='#e74c3c')
+        fig.update_layout(hovermode='x unified')
         st.plotly_chart(fig, use_container_width=True)
 
 # Category trends over time
@@ -163,8 +172,9 @@ SELECT
     year,
     quarter,
     category,
-    SUM(sale_price) as revenue
-FROM orders
+    SUM(revenue) as revenue,
+    'Q' || quarter || ' ' || year as period
+FROM orders_rollup
 GROUP BY year, quarter, category
 ORDER BY year, quarter, category
 """
@@ -172,8 +182,6 @@ ORDER BY year, quarter, category
 df_cat_trend = run_query(query_cat_trend)
 
 if not df_cat_trend.empty:
-    df_cat_trend['period'] = 'Q' + df_cat_trend['quarter'].astype(str) + ' ' + df_cat_trend['year'].astype(str)
-
     fig = px.area(
         df_cat_trend,
         x='period',
@@ -182,6 +190,9 @@ if not df_cat_trend.empty:
         title='Revenue by Category Over Time',
         labels={'revenue': 'Revenue ($)', 'period': 'Quarter'}
     )
+    # One hover label per quarter instead of a point lookup across every
+    # stacked category trace
+    fig.update_layout(hovermode='x unified')
     st.plotly_chart(fig, use_container_width=True)
 
 # Growth metrics
@@ -192,10 +203,10 @@ query_growth = """
 WITH yearly AS (
     SELECT
         year,
-        SUM(sale_price) as revenue,
+        SUM(revenue) as revenue,
         SUM(profit) as profit,
-        COUNT(*) as orders
-    FROM orders
+        SUM(orders) as orders
+    FROM orders_rollup
     GROUP BY year
 )
 SELECT
@@ -236,10 +247,9 @@ if not df_growth.empty:
 
 # Data download
 if not df_monthly.empty:
-    csv = df_monthly.to_csv(index=False)
     st.download_button(
         label="Download Monthly Data",
-        data=csv,
+        data=lambda: df_monthly.to_csv(index=False),
         file_name="time_series_data.csv",
         mime="text/csv"
     )
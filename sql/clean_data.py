@@ -1,14 +1,28 @@
 # ABOUTME: Data cleaning and transformation module for retail orders dataset.
 # ABOUTME: Loads raw CSV, cleans columns, calculates derived fields, and exports clean data.
 
+from pathlib import Path
+
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+
+MONTH_NAMES = {
+    1: 'January', 2: 'February', 3: 'March', 4: 'April',
+    5: 'May', 6: 'June', 7: 'July', 8: 'August',
+    9: 'September', 10: 'October', 11: 'November', 12: 'December'
+}
 
 
 def load_raw_data(input_path: str) -> pd.DataFrame:
     """
     Load raw CSV data with proper NA value handling.
 
+    Parsing uses the multithreaded PyArrow CSV reader, and Order Date is
+    parsed to datetime while reading.
+
     Args:
         input_path: Path to the raw CSV file.
 
@@ -16,10 +30,33 @@ def load_raw_data(input_path: str) -> pd.DataFrame:
         DataFrame with raw data, placeholder values converted to NaN.
     """
     na_values = ['Not Available', 'unknown', 'NA', 'N/A', '']
-    df = pd.read_csv(input_path, na_values=na_values)
+    df = pd.read_csv(
+        input_path,
+        engine='pyarrow',
+        na_values=na_values,
+        parse_dates=['Order Date']
+    )
     return df
 
 
+def clean_labels(series: pd.Series) -> pd.Series:
+    """
+    Strip whitespace and title-case a low-cardinality text column.
+
+    The string operations run once per distinct value and the results are
+    mapped back onto the rows, instead of running once per row.
+
+    Args:
+        series: Text column to clean.
+
+    Returns:
+        Cleaned column, with missing values left as NaN.
+    """
+    uniques = series.dropna().unique()
+    cleaned = pd.Index(uniques).str.strip().str.title()
+    return series.map(dict(zip(uniques, cleaned)))
+
+
 def transform_columns(df: pd.DataFrame) -> pd.DataFrame:
     """
     Transform column names and data types, add calculated fields.
@@ -35,40 +72,68 @@ def transform_columns(df: pd.DataFrame) -> pd.DataFrame:
     # Rename columns to snake_case
     df.columns = df.columns.str.lower().str.replace(' ', '_')
 
-    # Convert order_date to datetime
+    # Convert order_date to datetime (no-op when already parsed on load)
     df['order_date'] = pd.to_datetime(df['order_date'], format='%Y-%m-%d')
 
-    # Calculate derived fields
-    df['discount'] = df['list_price'] * df['discount_percent'] / 100
-    df['sale_price'] = df['list_price'] - df['discount']
-    df['profit'] = df['sale_price'] - df['cost_price']
-
-    # Handle division by zero for profit_margin
-    df['profit_margin'] = np.where(
-        df['sale_price'] != 0,
-        (df['profit'] / df['sale_price'] * 100).round(2),
-        0
-    )
+    # Calculate derived fields on the underlying arrays, so each step is one
+    # NumPy pass with no Series index alignment, and write each column once
+    list_price = df['list_price'].to_numpy(dtype=float)
+    discount = list_price * df['discount_percent'].to_numpy(dtype=float)
+    discount /= 100
+    sale_price = list_price - discount
+    profit = sale_price - df['cost_price'].to_numpy(dtype=float)
+
+    # Handle division by zero for profit_margin: divide only where
+    # sale_price is non-zero, other rows keep the zero-initialised margin
+    margin = np.zeros_like(sale_price)
+    np.divide(profit, sale_price, out=margin, where=sale_price != 0)
+    margin *= 100
+
+    df['discount'] = discount
+    df['sale_price'] = sale_price
+    df['profit'] = profit
+    df['profit_margin'] = np.round(margin, 2)
 
     # Extract date components
     df['year'] = df['order_date'].dt.year
     df['month'] = df['order_date'].dt.month
-    df['month_name'] = df['order_date'].dt.strftime('%B')
+    df['month_name'] = df['month'].map(MONTH_NAMES)
     df['quarter'] = df['order_date'].dt.quarter
 
     # Clean categorical data - strip whitespace and title case
-    df['category'] = df['category'].str.strip().str.title()
-    df['sub_category'] = df['sub_category'].str.strip().str.title()
-    df['region'] = df['region'].str.strip().str.title()
+    for col in ['category', 'sub_category', 'region']:
+        df[col] = clean_labels(df[col])
 
     return df
 
 
+def write_csv(df: pd.DataFrame, output_path: str) -> None:
+    """
+    Write a DataFrame as CSV with PyArrow's native CSV writer.
+
+    Timestamp columns hold dates only, so they are written as YYYY-MM-DD
+    like pandas does; the cast fails rather than drop a time of day.
+
+    Args:
+        df: DataFrame to write.
+        output_path: Path to save the CSV file.
+    """
+    table = pa.Table.from_pandas(df, preserve_index=False)
+
+    for i, field in enumerate(table.schema):
+        if pa.types.is_timestamp(field.type):
+            table = table.set_column(i, field.name, pc.cast(table[field.name], pa.date32()))
+
+    pacsv.write_csv(table, output_path)
+
+
 def clean_retail_orders(input_path: str, output_path: str) -> pd.DataFrame:
     """
     Full data cleaning pipeline for retail orders.
 
-    Loads raw data, applies transformations, and saves cleaned output.
+    Loads raw data, applies transformations, and saves cleaned output as CSV
+    plus a Snappy-compressed Parquet copy next to it (same name, .parquet
+    suffix) that keeps column dtypes and loads without re-parsing text.
 
     Args:
         input_path: Path to raw CSV file.
@@ -84,9 +149,12 @@ def clean_retail_orders(input_path: str, output_path: str) -> pd.DataFrame:
     df = transform_columns(df)
 
     # Save cleaned data
-    df.to_csv(output_path, index=False)
+    write_csv(df, output_path)
+
+    parquet_path = Path(output_path).with_suffix('.parquet')
+    df.to_parquet(parquet_path, engine='pyarrow', compression='snappy', index=False)
 
-    print(f"Cleaned data saved to {output_path}")
+    print(f"Cleaned data saved to {output_path} and {parquet_path}")
     print(f"Total rows: {len(df):,}")
     print(f"Date range: {df['order_date'].min()} to {df['order_date'].max()}")
 
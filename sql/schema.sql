@@ -1,5 +1,5 @@
 -- ABOUTME: PostgreSQL schema for retail orders analytics database.
--- ABOUTME: Defines orders table, indexes for query performance, and summary view.
+-- ABOUTME: Defines orders table, indexes for query performance, and summary views.
 
 -- Create main orders table
 CREATE TABLE IF NOT EXISTS orders (
@@ -19,14 +19,21 @@ CREATE TABLE IF NOT EXISTS orders (
     list_price DECIMAL(10,2),
     quantity INTEGER,
     discount_percent DECIMAL(5,2),
-    discount DECIMAL(10,2),
-    sale_price DECIMAL(10,2),
-    profit DECIMAL(10,2),
-    profit_margin DECIMAL(5,2),
-    year INTEGER,
-    month INTEGER,
-    month_name VARCHAR(20),
-    quarter INTEGER,
+    -- Derived fields, computed by Postgres from the raw columns on insert
+    discount DECIMAL(10,2) GENERATED ALWAYS AS (list_price * discount_percent / 100) STORED,
+    sale_price DECIMAL(10,2) GENERATED ALWAYS AS (list_price - list_price * discount_percent / 100) STORED,
+    profit DECIMAL(10,2) GENERATED ALWAYS AS (list_price - list_price * discount_percent / 100 - cost_price) STORED,
+    profit_margin DECIMAL(5,2) GENERATED ALWAYS AS (
+        CASE WHEN list_price - list_price * discount_percent / 100 = 0 THEN 0
+        ELSE (list_price - list_price * discount_percent / 100 - cost_price)
+             / (list_price - list_price * discount_percent / 100) * 100 END
+    ) STORED,
+    year INTEGER GENERATED ALWAYS AS (EXTRACT(YEAR FROM order_date)::integer) STORED,
+    month INTEGER GENERATED ALWAYS AS (EXTRACT(MONTH FROM order_date)::integer) STORED,
+    month_name VARCHAR(20) GENERATED ALWAYS AS ((ARRAY['January', 'February', 'March', 'April',
+        'May', 'June', 'July', 'August', 'September', 'October', 'November',
+        'December'])[EXTRACT(MONTH FROM order_date)::integer]) STORED,
+    quarter INTEGER GENERATED ALWAYS AS (EXTRACT(QUARTER FROM order_date)::integer) STORED,
     created_at TIMESTAMP DEFAULT NOW()
 );
 
@@ -35,6 +42,7 @@ CREATE INDEX IF NOT EXISTS idx_orders_order_date ON orders(order_date);
 CREATE INDEX IF NOT EXISTS idx_orders_product_id ON orders(product_id);
 CREATE INDEX IF NOT EXISTS idx_orders_category ON orders(category);
 CREATE INDEX IF NOT EXISTS idx_orders_region ON orders(region);
+CREATE INDEX IF NOT EXISTS idx_orders_segment ON orders(segment);
 CREATE INDEX IF NOT EXISTS idx_orders_year_month ON orders(year, month);
 
 -- Create view for summary statistics
@@ -48,3 +56,40 @@ SELECT
     MIN(order_date) as first_order_date,
     MAX(order_date) as last_order_date
 FROM orders;
+
+-- Pre-aggregated monthly rollup for dashboard trend, segment and region
+-- queries. AVG(profit_margin) re-aggregates as SUM(margin_sum) /
+-- SUM(margin_count), which skips NULL margins as AVG does. Refresh after each
+-- data load with:
+--   REFRESH MATERIALIZED VIEW orders_rollup;
+CREATE MATERIALIZED VIEW IF NOT EXISTS orders_rollup AS
+SELECT
+    year,
+    quarter,
+    month,
+    month_name,
+    category,
+    sub_category,
+    region,
+    segment,
+    COUNT(*)::integer as orders,
+    SUM(sale_price) as revenue,
+    SUM(profit) as profit,
+    SUM(profit_margin) as margin_sum,
+    COUNT(profit_margin)::integer as margin_count
+FROM orders
+GROUP BY year, quarter, month, month_name, category, sub_category, region, segment;
+
+CREATE INDEX IF NOT EXISTS idx_orders_rollup_year_month ON orders_rollup(year, month);
+
+-- Single-row lookup of the dashboard filter values, so the filter widgets
+-- never scan orders. Refresh after each data load with:
+--   REFRESH MATERIALIZED VIEW orders_catalog;
+CREATE MATERIALIZED VIEW IF NOT EXISTS orders_catalog AS
+SELECT
+    array_agg(DISTINCT category ORDER BY category) as categories,
+    array_agg(DISTINCT region ORDER BY region) as regions,
+    array_agg(DISTINCT segment ORDER BY segment) as segments,
+    MIN(order_date) as min_date,
+    MAX(order_date) as max_date
+FROM orders;
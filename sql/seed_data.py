@@ -1,8 +1,16 @@
 # ABOUTME: Database seeding module for loading cleaned data into Supabase.
 # ABOUTME: Handles connection setup, data loading, and verification.
 
+import csv
+import functools
+import io
 import os
+import struct
+from typing import Dict, Iterator, List, Optional, Tuple
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
 from sqlalchemy import create_engine, text
 from dotenv import load_dotenv
 
@@ -28,60 +36,436 @@ def get_database_url() -> str:
     return url
 
 
+@functools.lru_cache(maxsize=None)
+def _get_engine():
+    """
+    Get the SQLAlchemy engine shared by every step of a seed run.
+
+    Created on first use and kept for the life of the process, so seeding
+    and verifying reuse one pool and connection instead of building and
+    disposing an engine per step. The pool holds a single connection, as
+    the steps run one after another.
+
+    Returns:
+        SQLAlchemy engine for the configured database.
+    """
+    return create_engine(get_database_url(), pool_size=1)
+
+
+# Dictionary-encoded text, loaded by pandas as a categorical
+_CATEGORY = pa.dictionary(pa.int32(), pa.string())
+
+# Column types pinned when reading the cleaned CSV; others are inferred.
+# Narrow integers and categoricals keep the frame small and still load as
+# BIGINT and TEXT. Prices and discounts stay float64 even when every value
+# in a file is whole.
+CLEANED_COLUMN_TYPES = {
+    'order_id': pa.int32(),
+    'order_date': pa.timestamp('us'),
+    'ship_mode': _CATEGORY,
+    'segment': _CATEGORY,
+    'country': _CATEGORY,
+    'postal_code': pa.int32(),
+    'region': _CATEGORY,
+    'category': _CATEGORY,
+    'sub_category': _CATEGORY,
+    'cost_price': pa.float64(),
+    'list_price': pa.float64(),
+    'quantity': pa.int16(),
+    'discount_percent': pa.float64(),
+    'discount': pa.float64(),
+    'sale_price': pa.float64(),
+    'profit': pa.float64(),
+    'profit_margin': pa.float64(),
+    'year': pa.int16(),
+    'month': pa.int8(),
+    'month_name': _CATEGORY,
+    'quarter': pa.int8(),
+}
+
+
 def load_cleaned_data(csv_path: str) -> pd.DataFrame:
     """
     Load cleaned CSV data for database insertion.
 
+    The file is memory-mapped and parsed by the PyArrow CSV reader, with
+    column types from CLEANED_COLUMN_TYPES.
+
     Args:
         csv_path: Path to the cleaned CSV file.
 
     Returns:
         DataFrame with order_date parsed as datetime.
     """
-    df = pd.read_csv(csv_path, parse_dates=['order_date'])
-    return df
+    with pa.memory_map(csv_path) as source:
+        table = pacsv.read_csv(
+            source,
+            read_options=pacsv.ReadOptions(block_size=8 << 20),
+            convert_options=pacsv.ConvertOptions(
+                column_types=CLEANED_COLUMN_TYPES,
+                strings_can_be_null=True
+            )
+        )
+        return table.to_pandas(split_blocks=True, self_destruct=True)
+
+
+# Postgres column types by pandas dtype kind; anything else loads as TEXT.
+# These match the types pandas to_sql used to create.
+PG_COLUMN_TYPES = {
+    'i': 'BIGINT',
+    'u': 'BIGINT',
+    'f': 'DOUBLE PRECISION',
+    'M': 'TIMESTAMP',
+    'b': 'BOOLEAN',
+}
+
+
+# Derived order fields, repeated inline because a generated column cannot
+# reference another one. The arithmetic follows transform_columns step by
+# step, so the database reproduces the cleaned values bit for bit; round()
+# on DOUBLE PRECISION rounds half to even like np.round.
+_DISCOUNT_SQL = "(list_price * discount_percent)::double precision / 100"
+_SALE_PRICE_SQL = f"(list_price - {_DISCOUNT_SQL})"
+_PROFIT_SQL = f"({_SALE_PRICE_SQL} - cost_price)"
+_MONTH_NAMES_SQL = (
+    "ARRAY['January', 'February', 'March', 'April', 'May', 'June', 'July', "
+    "'August', 'September', 'October', 'November', 'December']"
+)
+
+# Columns Postgres computes from the raw order fields on insert, so the load
+# ships only the raw columns and skips the derived ones
+ORDERS_GENERATED_COLUMNS = {
+    'discount': f'DOUBLE PRECISION GENERATED ALWAYS AS ({_DISCOUNT_SQL}) STORED',
+    'sale_price': f'DOUBLE PRECISION GENERATED ALWAYS AS ({_SALE_PRICE_SQL}) STORED',
+    'profit': f'DOUBLE PRECISION GENERATED ALWAYS AS ({_PROFIT_SQL}) STORED',
+    'profit_margin': (
+        f'DOUBLE PRECISION GENERATED ALWAYS AS (CASE WHEN {_SALE_PRICE_SQL} = 0 THEN 0 '
+        f'ELSE round({_PROFIT_SQL} / {_SALE_PRICE_SQL} * 100 * 100) / 100 END) STORED'
+    ),
+    'year': 'BIGINT GENERATED ALWAYS AS (EXTRACT(YEAR FROM order_date)::bigint) STORED',
+    'month': 'BIGINT GENERATED ALWAYS AS (EXTRACT(MONTH FROM order_date)::bigint) STORED',
+    'month_name': (
+        f'TEXT GENERATED ALWAYS AS (({_MONTH_NAMES_SQL})[EXTRACT(MONTH FROM order_date)::int]) STORED'
+    ),
+    'quarter': 'BIGINT GENERATED ALWAYS AS (EXTRACT(QUARTER FROM order_date)::bigint) STORED',
+}
+
+
+# Column types of the orders table, in cleaned CSV column order. The raw
+# columns match what create_table_sql derives from the cleaned DataFrame.
+ORDERS_COLUMN_TYPES = {
+    'order_id': 'BIGINT',
+    'order_date': 'TIMESTAMP',
+    'ship_mode': 'TEXT',
+    'segment': 'TEXT',
+    'country': 'TEXT',
+    'city': 'TEXT',
+    'state': 'TEXT',
+    'postal_code': 'BIGINT',
+    'region': 'TEXT',
+    'category': 'TEXT',
+    'sub_category': 'TEXT',
+    'product_id': 'TEXT',
+    'cost_price': 'DOUBLE PRECISION',
+    'list_price': 'DOUBLE PRECISION',
+    'quantity': 'BIGINT',
+    'discount_percent': 'DOUBLE PRECISION',
+    **ORDERS_GENERATED_COLUMNS,
+}
+
+
+def _create_table_ddl(table_name: str, column_types: Dict[str, str]) -> str:
+    """
+    Build a CREATE TABLE statement from column names and Postgres types.
 
+    Args:
+        table_name: Name of the table to create.
+        column_types: Mapping of column name to Postgres type, in order.
 
-def seed_database(csv_path: str) -> int:
+    Returns:
+        CREATE TABLE SQL string.
     """
-    Load cleaned data into Supabase PostgreSQL database.
+    columns = ",\n    ".join(f'"{col}" {pg_type}' for col, pg_type in column_types.items())
+    return f'CREATE TABLE "{table_name}" (\n    {columns}\n)'
+
+
+def create_table_sql(df: pd.DataFrame, table_name: str,
+                     generated_columns: Optional[Dict[str, str]] = None) -> str:
+    """
+    Build a CREATE TABLE statement with column types derived from df.dtypes.
 
     Args:
-        csv_path: Path to the cleaned CSV file.
+        df: DataFrame whose columns define the table.
+        table_name: Name of the table to create.
+        generated_columns: Optional mapping of column name to generated
+            column definition, added after the columns of df.
 
     Returns:
-        Number of rows loaded.
+        CREATE TABLE SQL string.
     """
-    # Get database URL
-    database_url = get_database_url()
+    column_types = {
+        col: PG_COLUMN_TYPES.get(dtype.kind, 'TEXT') for col, dtype in df.dtypes.items()
+    }
+    column_types.update(generated_columns or {})
+    return _create_table_ddl(table_name, column_types)
 
-    # Create SQLAlchemy engine
-    engine = create_engine(database_url)
 
-    # Load cleaned data
-    df = load_cleaned_data(csv_path)
+# Binary COPY framing: signature, flags word and header extension length
+PGCOPY_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack('>ii', 0, 0)
+PGCOPY_TRAILER = struct.pack('>h', -1)
+
+# Postgres timestamps count microseconds from 2000-01-01
+PG_EPOCH = np.datetime64('2000-01-01T00:00:00', 'us')
+
+# Big-endian wire dtypes for the fixed-width columns in PG_COLUMN_TYPES
+PGCOPY_FIXED_DTYPES = {
+    'i': '>i8',
+    'u': '>i8',
+    'f': '>f8',
+    'M': '>i8',
+    'b': '?',
+}
+
+
+def _column_payloads(
+    series: pd.Series
+) -> Tuple[np.ndarray, Optional[np.ndarray], np.ndarray, np.ndarray]:
+    """
+    Lay out one column's binary COPY values as a flat byte array.
+
+    Fixed-width columns are cast to their big-endian wire dtype in one
+    NumPy pass; text columns are converted to an Arrow string array, whose
+    UTF-8 data and offsets buffers already hold every value back to back.
+
+    Args:
+        series: Column to encode, with a dtype kind from PG_COLUMN_TYPES.
+
+    Returns:
+        Tuple of (data, starts, lengths, isna): the value bytes as uint8,
+        each row's start offset and byte length in data, and the NULL mask.
+        NULL rows have length 0. For fixed-width columns data is a 2-D
+        array with one row of value bytes per column row, and starts is
+        None.
+    """
+    isna = series.isna().to_numpy()
+    kind = series.dtype.kind
+
+    if kind not in PGCOPY_FIXED_DTYPES:
+        if series.dtype == object:
+            # Arbitrary Python objects are sent as their str()
+            series = series.map(str, na_action='ignore')
+        # Casting also decodes categoricals, which arrive dictionary-encoded
+        array = pa.array(series, from_pandas=True).cast(pa.large_string())
+        if isinstance(array, pa.ChunkedArray):
+            array = array.combine_chunks()
+
+        _, offsets_buffer, data_buffer = array.buffers()
+        offsets = np.frombuffer(offsets_buffer, dtype=np.int64)
+        offsets = offsets[array.offset:array.offset + len(array) + 1]
+        data = np.frombuffer(data_buffer, dtype=np.uint8) if data_buffer else np.empty(0, np.uint8)
+        return data, offsets[:-1], np.diff(offsets), isna
+
+    if kind == 'M':
+        values = (series.to_numpy(dtype='datetime64[us]') - PG_EPOCH).view('i8')
+    else:
+        values = series.to_numpy()
+    wire_dtype = np.dtype(PGCOPY_FIXED_DTYPES[kind])
+
+    data = np.where(isna, 0, values).astype(wire_dtype).view(np.uint8)
+    width = wire_dtype.itemsize
+    return data.reshape(-1, width), None, np.where(isna, 0, width), isna
+
+
+def _scatter_ranges(out: np.ndarray, out_starts: np.ndarray, data: np.ndarray,
+                    data_starts: np.ndarray, lengths: np.ndarray) -> None:
+    """
+    Copy variable-length byte ranges of data into out with one fancy-index.
+
+    Args:
+        out: Destination byte buffer.
+        out_starts: Offset in out where each range is written.
+        data: Source byte buffer.
+        data_starts: Offset in data where each range begins.
+        lengths: Byte length of each range.
+    """
+    total = int(lengths.sum())
+    if total == 0:
+        return
+    within = np.arange(total) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    out[np.repeat(out_starts, lengths) + within] = data[np.repeat(data_starts, lengths) + within]
 
-    print(f"Loading {len(df):,} rows into Supabase...")
 
-    # Drop dependent view first (if exists)
-    with engine.connect() as conn:
-        conn.execute(text("DROP VIEW IF EXISTS order_summary CASCADE"))
-        conn.commit()
-        print("Dropped existing view...")
-
-    # Load to database (replace existing data)
-    df.to_sql(
-        'orders',
-        engine,
-        if_exists='replace',
-        index=False,
-        method='multi',
-        chunksize=1000
+def _df_to_pgcopy_binary(df: pd.DataFrame) -> Iterator[bytes]:
+    """
+    Serialize a DataFrame in the Postgres binary COPY format.
+
+    Every row is laid out in one preallocated byte buffer: row sizes are
+    summed from the field lengths, then each column's length words and
+    values are scattered to their row offsets with vectorized NumPy
+    indexing, so no Python code runs per row or per value.
+
+    Args:
+        df: DataFrame whose column dtypes match the types in PG_COLUMN_TYPES.
+
+    Yields:
+        Header, row data and trailer as byte chunks.
+    """
+    yield PGCOPY_HEADER
+
+    columns = [_column_payloads(df[col]) for col in df.columns]
+
+    # Each row is an int16 field count, then per field an int32 length
+    # (-1 for NULL) followed by the value bytes
+    row_sizes = np.full(len(df), 2, dtype=np.int64)
+    for _, _, lengths, _ in columns:
+        row_sizes += 4 + lengths
+    row_ends = np.cumsum(row_sizes)
+    positions = row_ends - row_sizes
+
+    out = np.empty(int(row_ends[-1]) if len(df) else 0, dtype=np.uint8)
+    out[positions[:, None] + np.arange(2)] = (
+        np.full(len(df), len(df.columns), dtype='>i2').view(np.uint8).reshape(-1, 2)
     )
+    positions += 2
+
+    for data, starts, lengths, isna in columns:
+        length_words = np.where(isna, -1, lengths).astype('>i4').view(np.uint8)
+        out[positions[:, None] + np.arange(4)] = length_words.reshape(-1, 4)
+        if starts is None:
+            present = ~isna
+            out[(positions[present] + 4)[:, None] + np.arange(data.shape[1])] = data[present]
+        else:
+            _scatter_ranges(out, positions + 4, data, starts, lengths)
+        positions += 4 + lengths
+
+    yield out.tobytes()
+
+    yield PGCOPY_TRAILER
+
+
+class _IteratorReader(io.RawIOBase):
+    """Read-only file object over an iterator of byte chunks, for copy_expert."""
+
+    def __init__(self, chunks: Iterator[bytes]):
+        self._chunks = chunks
+        self._pending = b''
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._pending:
+            try:
+                # A memoryview lets each read take a slice without copying
+                # the rest of the chunk
+                self._pending = memoryview(next(self._chunks))
+            except StopIteration:
+                return 0
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+
+def copy_dataframe(cursor, df: pd.DataFrame, table_name: str,
+                   rows_per_copy: int = 10_000) -> None:
+    """
+    Stream a DataFrame into an existing table with binary COPY FROM STDIN.
+
+    Values go over the wire in Postgres' binary representation, so neither
+    side formats or parses numbers and timestamps as text. Missing values
+    are sent as NULL. Rows are encoded and sent one slice at a time, one
+    COPY per slice on the caller's transaction, so memory for the encoded
+    data stays bounded by the slice size rather than the frame size.
+
+    Args:
+        cursor: psycopg2 cursor on the target database.
+        df: DataFrame whose columns match the table, in order.
+        table_name: Name of the table to load.
+        rows_per_copy: Maximum number of rows sent in each COPY.
+    """
+    columns = ", ".join(f'"{col}"' for col in df.columns)
+    copy_sql = f'COPY "{table_name}" ({columns}) FROM STDIN WITH (FORMAT BINARY)'
+
+    for start in range(0, len(df), rows_per_copy):
+        chunk = df.iloc[start:start + rows_per_copy]
+        cursor.copy_expert(copy_sql, _IteratorReader(_df_to_pgcopy_binary(chunk)))
+
+
+# Indexes from schema.sql, created once the orders table is loaded
+ORDERS_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_orders_order_date ON orders(order_date)",
+    "CREATE INDEX IF NOT EXISTS idx_orders_product_id ON orders(product_id)",
+    "CREATE INDEX IF NOT EXISTS idx_orders_category ON orders(category)",
+    "CREATE INDEX IF NOT EXISTS idx_orders_region ON orders(region)",
+    "CREATE INDEX IF NOT EXISTS idx_orders_segment ON orders(segment)",
+    "CREATE INDEX IF NOT EXISTS idx_orders_year_month ON orders(year, month)",
+]
+
+
+def _drop_dependent_views(conn) -> None:
+    """
+    Drop the views that depend on the orders table.
+
+    Args:
+        conn: SQLAlchemy connection inside the seed transaction.
+    """
+    conn.execute(text("DROP VIEW IF EXISTS order_summary CASCADE"))
+    conn.execute(text("DROP MATERIALIZED VIEW IF EXISTS orders_rollup CASCADE"))
+    conn.execute(text("DROP MATERIALIZED VIEW IF EXISTS orders_catalog CASCADE"))
+    print("Dropped existing views...")
+
+
+def _recreate_orders_table(conn, ddl: str) -> None:
+    """
+    Replace the orders table with an empty one.
+
+    Created in the same transaction as the load, so with wal_level=minimal
+    Postgres writes the COPY straight to the table files instead of WAL.
+
+    Args:
+        conn: SQLAlchemy connection inside the seed transaction.
+        ddl: CREATE TABLE statement for the orders table.
+    """
+    conn.execute(text("DROP TABLE IF EXISTS orders"))
+    conn.execute(text(ddl))
+
+
+def _create_orders_indexes(conn) -> None:
+    """
+    Create the orders indexes from schema.sql on the freshly loaded table.
+
+    Built after the load so COPY does not maintain them row by row.
+
+    Args:
+        conn: SQLAlchemy connection inside the seed transaction.
+    """
+    for statement in ORDERS_INDEXES:
+        conn.execute(text(statement))
+    print("Created orders indexes...")
+
 
-    print("Data loaded successfully!")
+def _begin_seed_transaction(conn) -> None:
+    """
+    Tune the seed transaction for a bulk load.
+
+    Both settings are LOCAL, so they end with the transaction.
+
+    Args:
+        conn: SQLAlchemy connection that has just begun the seed transaction.
+    """
+    conn.execute(text("SET LOCAL synchronous_commit = OFF"))
+    conn.execute(text("SET LOCAL maintenance_work_mem = '512MB'"))
 
-    # Recreate the summary view
+
+def _create_dependent_views(conn) -> None:
+    """
+    Recreate the order_summary view and the orders_rollup and orders_catalog
+    materialized views.
+
+    Args:
+        conn: SQLAlchemy connection inside the seed transaction.
+    """
     view_sql = text("""
     CREATE OR REPLACE VIEW order_summary AS
     SELECT
@@ -94,17 +478,179 @@ def seed_database(csv_path: str) -> int:
         MAX(order_date) as last_order_date
     FROM orders
     """)
-    with engine.connect() as conn:
-        conn.execute(view_sql)
-        conn.commit()
-        print("Recreated order_summary view...")
+    conn.execute(view_sql)
+    print("Recreated order_summary view...")
+
+    # Rebuild the monthly rollup the dashboard aggregates over
+    rollup_sql = text("""
+    CREATE MATERIALIZED VIEW orders_rollup AS
+    SELECT
+        year,
+        quarter,
+        month,
+        month_name,
+        category,
+        sub_category,
+        region,
+        segment,
+        COUNT(*)::integer as orders,
+        SUM(sale_price) as revenue,
+        SUM(profit) as profit,
+        SUM(profit_margin) as margin_sum,
+        COUNT(profit_margin)::integer as margin_count
+    FROM orders
+    GROUP BY year, quarter, month, month_name, category, sub_category, region, segment
+    """)
+    conn.execute(rollup_sql)
+    conn.execute(text(
+        "CREATE INDEX idx_orders_rollup_year_month ON orders_rollup(year, month)"
+    ))
+    print("Recreated orders_rollup materialized view...")
+
+    # Filter widget values, read by the dashboard as a single row
+    catalog_sql = text("""
+    CREATE MATERIALIZED VIEW orders_catalog AS
+    SELECT
+        array_agg(DISTINCT category ORDER BY category) as categories,
+        array_agg(DISTINCT region ORDER BY region) as regions,
+        array_agg(DISTINCT segment ORDER BY segment) as segments,
+        MIN(order_date) as min_date,
+        MAX(order_date) as max_date
+    FROM orders
+    """)
+    conn.execute(catalog_sql)
+    print("Recreated orders_catalog materialized view...")
 
-    # Clean up
-    engine.dispose()
+
+def seed_database(csv_path: str) -> int:
+    """
+    Load cleaned data into Supabase PostgreSQL database.
+
+    Args:
+        csv_path: Path to the cleaned CSV file.
+
+    Returns:
+        Number of rows loaded.
+    """
+    engine = _get_engine()
+
+    # Load cleaned data; Postgres generates the derived columns itself, so
+    # only the raw ones are sent
+    df = load_cleaned_data(csv_path).drop(
+        columns=list(ORDERS_GENERATED_COLUMNS), errors='ignore'
+    )
+
+    print(f"Loading {len(df):,} rows into Supabase...")
+
+    # One transaction for the whole reload: a failure at any step rolls
+    # back to the previous table and views, and there is a single commit
+    with engine.begin() as conn:
+        _begin_seed_transaction(conn)
+        _drop_dependent_views(conn)
+
+        # Replace the table: recreate it empty, then bulk load it with COPY
+        # on the same underlying psycopg2 connection
+        _recreate_orders_table(conn, create_table_sql(
+            df, 'orders', generated_columns=ORDERS_GENERATED_COLUMNS
+        ))
+        with conn.connection.cursor() as cur:
+            copy_dataframe(cur, df, 'orders')
+        print("Data loaded successfully!")
+
+        _create_orders_indexes(conn)
+        _create_dependent_views(conn)
 
     return len(df)
 
 
+def _csv_columns_stream(csv_path: str, columns: List[str]) -> Iterator[bytes]:
+    """
+    Re-encode selected columns of a CSV file as headerless CSV, block by block.
+
+    The file is memory-mapped while it is read. Values are read as text and
+    written back unchanged, and only unquoted empty fields become empty
+    output fields, so COPY's NULL '' sees the same NULLs it would in the
+    original file.
+
+    Args:
+        csv_path: Path to the CSV file.
+        columns: Names of the columns to keep, in output order.
+
+    Yields:
+        CSV data for one block of rows at a time.
+    """
+    write_options = pacsv.WriteOptions(include_header=False)
+
+    with pa.memory_map(csv_path) as source:
+        reader = pacsv.open_csv(
+            source,
+            read_options=pacsv.ReadOptions(block_size=8 << 20),
+            convert_options=pacsv.ConvertOptions(
+                include_columns=columns,
+                column_types={col: pa.string() for col in columns},
+                null_values=[''],
+                strings_can_be_null=True,
+                quoted_strings_can_be_null=False
+            )
+        )
+        for batch in reader:
+            sink = pa.BufferOutputStream()
+            pacsv.write_csv(batch, sink, write_options=write_options)
+            yield sink.getvalue().to_pybytes()
+
+
+def seed_database_from_csv(csv_path: str) -> int:
+    """
+    Load the cleaned CSV file into the database without building a DataFrame.
+
+    The raw columns are streamed into COPY ... FROM STDIN as CSV text, so
+    the data is parsed once, by Postgres, which also computes the derived
+    columns in ORDERS_GENERATED_COLUMNS. Columns are matched by the CSV
+    header and typed from ORDERS_COLUMN_TYPES.
+
+    Args:
+        csv_path: Path to the cleaned CSV file.
+
+    Returns:
+        Number of rows loaded.
+
+    Raises:
+        ValueError: If the CSV header has columns the orders table lacks.
+    """
+    with open(csv_path, newline='', encoding='utf-8') as f:
+        header = next(csv.reader(f))
+
+    unknown = [col for col in header if col not in ORDERS_COLUMN_TYPES]
+    if unknown:
+        raise ValueError(f"Unexpected columns in {csv_path}: {', '.join(unknown)}")
+
+    engine = _get_engine()
+
+    print(f"Streaming {csv_path} into Supabase...")
+
+    raw_columns = [col for col in header if col not in ORDERS_GENERATED_COLUMNS]
+    columns = ", ".join(f'"{col}"' for col in raw_columns)
+
+    with engine.begin() as conn:
+        _begin_seed_transaction(conn)
+        _drop_dependent_views(conn)
+        _recreate_orders_table(conn, _create_table_ddl('orders', ORDERS_COLUMN_TYPES))
+
+        with conn.connection.cursor() as cur:
+            cur.copy_expert(
+                f"COPY orders ({columns}) FROM STDIN WITH (FORMAT CSV, NULL '')",
+                _IteratorReader(_csv_columns_stream(csv_path, raw_columns))
+            )
+            cur.execute("SELECT COUNT(*) FROM orders")
+            row_count = cur.fetchone()[0]
+        print("Data loaded successfully!")
+
+        _create_orders_indexes(conn)
+        _create_dependent_views(conn)
+
+    return row_count
+
+
 def verify_load() -> int:
     """
     Verify data was loaded correctly by querying row count.
@@ -112,13 +658,14 @@ def verify_load() -> int:
     Returns:
         Number of rows in the orders table.
     """
-    database_url = get_database_url()
-    engine = create_engine(database_url)
-
-    result = pd.read_sql("SELECT COUNT(*) as count FROM orders", engine)
-    count = result['count'].iloc[0]
-
-    engine.dispose()
+    raw_conn = _get_engine().raw_connection()
+    try:
+        with raw_conn.cursor() as cur:
+            cur.execute("SELECT COUNT(*) FROM orders")
+            count = cur.fetchone()[0]
+    finally:
+        # Returns the connection to the shared engine's pool
+        raw_conn.close()
 
     return count
 
@@ -127,7 +674,7 @@ if __name__ == "__main__":
     csv_path = 'data/processed/orders_clean.csv'
 
     print("Starting database seed...")
-    row_count = seed_database(csv_path)
+    row_count = seed_database_from_csv(csv_path)
     print(f"Loaded {row_count:,} rows")
 
     print("\nVerifying load...")
@@ -121,6 +121,22 @@ class TestTransformColumns:
         assert df['region'].iloc[0] == 'South'
 
 
+class TestCleanLabels:
+    """Tests for per-value text cleaning."""
+
+    def test_clean_labels_merges_variants(self):
+        """Variants that differ only in whitespace or case should collapse to one label."""
+        from sql.clean_data import clean_labels
+
+        series = pd.Series([' office supplies', 'Office Supplies', 'FURNITURE ', None])
+        result = clean_labels(series)
+
+        assert result.iloc[0] == 'Office Supplies'
+        assert result.iloc[1] == 'Office Supplies'
+        assert result.iloc[2] == 'Furniture'
+        assert pd.isna(result.iloc[3])
+
+
 class TestCleanRetailOrders:
     """Integration tests for the full cleaning pipeline."""
 
@@ -157,6 +173,18 @@ class TestCleanRetailOrders:
         for col in expected_columns:
             assert col in df.columns, f"Missing column: {col}"
 
+    def test_clean_retail_orders_writes_parquet_copy(self, sample_csv_file, tmp_path):
+        """A Parquet copy with the same data and dtypes should be written next to the CSV."""
+        from sql.clean_data import clean_retail_orders
+
+        output_path = tmp_path / "orders_clean.csv"
+        df_returned = clean_retail_orders(sample_csv_file, str(output_path))
+        df_parquet = pd.read_parquet(tmp_path / "orders_clean.parquet")
+
+        assert list(df_parquet.columns) == list(df_returned.columns)
+        assert pd.api.types.is_datetime64_any_dtype(df_parquet['order_date'])
+        assert df_parquet['profit_margin'].tolist() == df_returned['profit_margin'].tolist()
+
     def test_saved_csv_is_readable(self, sample_csv_file, tmp_path):
         """The saved CSV should be readable and match the returned DataFrame."""
         from sql.clean_data import clean_retail_orders
@@ -168,6 +196,17 @@ class TestCleanRetailOrders:
         assert len(df_returned) == len(df_loaded)
         assert list(df_returned.columns) == list(df_loaded.columns)
 
+    def test_saved_csv_writes_dates_without_time(self, sample_csv_file, tmp_path):
+        """order_date should be written as a plain YYYY-MM-DD date."""
+        from sql.clean_data import clean_retail_orders
+
+        output_path = tmp_path / "orders_clean.csv"
+        df_returned = clean_retail_orders(sample_csv_file, str(output_path))
+        df_loaded = pd.read_csv(output_path, dtype={'order_date': str})
+
+        expected = df_returned['order_date'].dt.strftime('%Y-%m-%d').tolist()
+        assert df_loaded['order_date'].tolist() == expected
+
 
 class TestEdgeCases:
     """Tests for edge cases and error handling."""
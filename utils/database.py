@@ -2,6 +2,10 @@
 # ABOUTME: Provides cached connection handling and common query functions.
 
 import os
+import contextlib
+import functools
+import threading
+from datetime import datetime
 import pandas as pd
 from typing import Optional, Tuple, List, Dict, Any
 
@@ -14,6 +18,8 @@ except ImportError:
 
 try:
     import psycopg2
+    import psycopg2.errors
+    import psycopg2.pool
     PSYCOPG2_AVAILABLE = True
 except ImportError:
     PSYCOPG2_AVAILABLE = False
@@ -37,12 +43,61 @@ def get_database_url() -> Optional[str]:
     return os.getenv('SUPABASE_DATABASE_URL')
 
 
-def get_database_connection():
+# Most connections the shared pool opens, and how long a query waits for
+# one to be returned when all of them are in use
+POOL_MAX_CONNECTIONS = 8
+POOL_WAIT_SECONDS = 30
+
+# One slot per pooled connection; ThreadedConnectionPool raises PoolError
+# rather than waiting when every connection is checked out
+_pool_slots = threading.BoundedSemaphore(POOL_MAX_CONNECTIONS)
+
+
+def _cache_resource(**cache_kwargs):
+    """
+    Share one instance per process with st.cache_resource when available.
+
+    Falls back to functools.lru_cache outside Streamlit.
+
+    Args:
+        **cache_kwargs: Keyword arguments passed through to st.cache_resource.
+
+    Returns:
+        Decorator that returns the cached function.
+    """
+    def decorator(func):
+        if STREAMLIT_AVAILABLE:
+            return st.cache_resource(**cache_kwargs)(func)
+        return functools.lru_cache(maxsize=None)(func)
+    return decorator
+
+
+@_cache_resource(validate=lambda pool: not pool.closed)
+def _open_pool(url: str):
+    """
+    Open the shared pool of database connections.
+
+    Streamlit serves each session on its own thread, so a thread-safe pool
+    lets concurrent reruns query in parallel instead of queueing on a
+    single connection. The pool is shared across reruns and sessions, so
+    callers must return connections with putconn rather than close them.
+
+    Args:
+        url: Database URL to connect to.
+
+    Returns:
+        psycopg2 ThreadedConnectionPool holding 1 to POOL_MAX_CONNECTIONS
+        connections.
     """
-    Create database connection using psycopg2.
+    return psycopg2.pool.ThreadedConnectionPool(1, POOL_MAX_CONNECTIONS, url)
+
+
+def get_connection_pool():
+    """
+    Get the shared connection pool, connecting on first use.
 
     Returns:
-        Database connection or None if connection fails.
+        Connection pool or None if connection fails.
     """
     if not PSYCOPG2_AVAILABLE:
         return None
@@ -52,53 +107,282 @@ def get_database_connection():
         return None
 
     try:
-        conn = psycopg2.connect(url)
-        return conn
+        return _open_pool(url)
     except Exception as e:
         if STREAMLIT_AVAILABLE:
             st.error(f"Failed to connect to database: {e}")
         return None
 
 
-def run_query(query: str) -> pd.DataFrame:
+def _cache_data(**cache_kwargs):
     """
-    Execute SQL query and return results as DataFrame.
+    Cache a function with st.cache_data when Streamlit is available.
+
+    Args:
+        **cache_kwargs: Keyword arguments passed through to st.cache_data.
+
+    Returns:
+        Decorator that returns the cached function, or the function unchanged
+        outside Streamlit.
+    """
+    def decorator(func):
+        if STREAMLIT_AVAILABLE:
+            return st.cache_data(**cache_kwargs)(func)
+        return func
+    return decorator
+
+
+@contextlib.contextmanager
+def _pooled_connection():
+    """
+    Borrow a connection from the shared pool for the duration of a block.
+
+    Waits up to POOL_WAIT_SECONDS for a connection to be returned when all
+    of them are in use.
+
+    Yields:
+        psycopg2 connection in read-only autocommit mode.
+
+    Raises:
+        ConnectionError: If no database connection is available, or none
+            was returned to the pool in time.
+    """
+    pool = get_connection_pool()
+    if pool is None:
+        raise ConnectionError("Database connection is not available")
+
+    if not _pool_slots.acquire(timeout=POOL_WAIT_SECONDS):
+        if STREAMLIT_AVAILABLE:
+            st.error("Timed out waiting for a free database connection")
+        raise ConnectionError("No database connection was free in time")
+
+    try:
+        conn = pool.getconn()
+        try:
+            # Autocommit keeps pooled connections from sitting idle inside a
+            # transaction between queries; configured once per new connection
+            if not conn.autocommit:
+                conn.set_session(readonly=True, autocommit=True)
+            yield conn
+        finally:
+            # Drop connections the server has closed instead of reusing them
+            pool.putconn(conn, close=bool(conn.closed))
+    finally:
+        _pool_slots.release()
+
+
+@_cache_data(ttl="10m", max_entries=200, show_spinner=False)
+def _fetch_query(query: str, params: Optional[Dict[str, Any]] = None) -> pd.DataFrame:
+    """
+    Execute SQL query and return results, raising on failure.
+
+    Failures propagate instead of returning an empty DataFrame so that
+    st.cache_data never stores them. Rows are fetched on a plain cursor and
+    built into a DataFrame directly, skipping the pandas SQL adapter.
 
     Args:
         query: SQL query string to execute.
+        params: Optional values for %(name)s placeholders in the query.
 
     Returns:
-        DataFrame with query results, or empty DataFrame on error.
+        DataFrame with query results.
+
+    Raises:
+        ConnectionError: If no database connection is available.
+    """
+    with _pooled_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(query, params)
+            columns = [col.name for col in cur.description]
+            rows = cur.fetchall()
+
+    # coerce_float turns NUMERIC results, which arrive as Decimal, into
+    # floats, as read_sql_query does
+    return pd.DataFrame.from_records(rows, columns=columns, coerce_float=True)
+
+
+# Fixed lookups run on every page render, kept as server-side prepared
+# statements so Postgres parses and plans them once per connection
+PREPARED_STATEMENTS = {
+    'q_summary': (
+        "SELECT total_orders, total_revenue, total_profit, avg_order_value, "
+        "avg_profit_margin, first_order_date, last_order_date FROM order_summary"
+    ),
+    'q_filter_options': (
+        "SELECT categories, regions, segments, min_date, max_date FROM orders_catalog"
+    ),
+}
+
+
+def _prepare_statement(cur, name: str) -> None:
     """
-    conn = get_database_connection()
-    if conn is None:
-        return pd.DataFrame()
+    Prepare a statement from PREPARED_STATEMENTS on the cursor's connection.
 
+    A statement of the same name already on the connection is deallocated
+    and prepared again.
+
+    Args:
+        cur: Cursor on an autocommit connection.
+        name: Key of the statement in PREPARED_STATEMENTS.
+    """
+    prepare_sql = f"PREPARE {name} AS {PREPARED_STATEMENTS[name]}"
     try:
-        df = pd.read_sql(query, conn)
-        return df
+        cur.execute(prepare_sql)
+    except psycopg2.errors.DuplicatePreparedStatement:
+        cur.execute(f"DEALLOCATE {name}")
+        cur.execute(prepare_sql)
+
+
+def _fetch_row(name: str) -> Dict[str, Any]:
+    """
+    Execute a single-row prepared statement with a plain cursor, raising on
+    failure.
+
+    Skips building a DataFrame when the result is a handful of scalars. The
+    statement is prepared the first time it runs on each pooled connection,
+    which also covers connections opened before the views existed, and
+    prepared again if a reseed has since rebuilt the view it reads.
+
+    Args:
+        name: Key of the statement in PREPARED_STATEMENTS.
+
+    Returns:
+        Dictionary of column name to value for the first row, or empty dict
+        if the query returned no rows.
+
+    Raises:
+        ConnectionError: If no database connection is available.
+    """
+    with _pooled_connection() as conn:
+        with conn.cursor() as cur:
+            try:
+                cur.execute(f"EXECUTE {name}")
+            except psycopg2.errors.InvalidSqlStatementName:
+                # Autocommit, so the failed EXECUTE leaves no aborted
+                # transaction behind
+                _prepare_statement(cur, name)
+                cur.execute(f"EXECUTE {name}")
+            except psycopg2.errors.FeatureNotSupported:
+                # The view was rebuilt with a different row type, which the
+                # cached plan can no longer return
+                cur.execute(f"DEALLOCATE {name}")
+                _prepare_statement(cur, name)
+                cur.execute(f"EXECUTE {name}")
+            row = cur.fetchone()
+            if row is None:
+                return {}
+            return dict(zip([col.name for col in cur.description], row))
+
+
+def _call_or_default(func, default_factory, *args):
+    """
+    Call a raising query function, falling back to a default on failure.
+
+    Args:
+        func: Function that raises on connection or query failure.
+        default_factory: Zero-argument callable building the fallback value.
+        *args: Arguments passed to func.
+
+    Returns:
+        Result of func, or default_factory() if it raised.
+    """
+    try:
+        return func(*args)
+    except ConnectionError:
+        # Reported where the connection failed
+        return default_factory()
     except Exception as e:
         if STREAMLIT_AVAILABLE:
             st.error(f"Query error: {e}")
-        return pd.DataFrame()
-    finally:
-        conn.close()
+        return default_factory()
+
+
+def run_query(query: str, params: Optional[Dict[str, Any]] = None) -> pd.DataFrame:
+    """
+    Execute SQL query and return results as DataFrame.
+
+    Results are cached per query string and parameters for 10 minutes, so
+    Streamlit reruns do not repeat the database roundtrip. Pass user input
+    through params rather than formatting it into the query, which keeps it
+    safe from SQL injection and keeps the cache key space small.
 
+    Args:
+        query: SQL query string to execute.
+        params: Optional values for %(name)s placeholders in the query.
+
+    Returns:
+        DataFrame with query results, or empty DataFrame on error.
+    """
+    return _call_or_default(_fetch_query, pd.DataFrame, query, params)
+
+
+def _cached_lookup(ttl: str, default_factory):
+    """
+    Cache a lookup's result with st.cache_data, falling back on failure.
+
+    The decorated function runs queries through _fetch_query, which raises
+    on failure, so only successful results are cached.
+
+    Args:
+        ttl: How long a cached result stays valid, e.g. "1h".
+        default_factory: Zero-argument callable building the value returned
+            when the lookup fails.
+
+    Returns:
+        Decorator that returns the cached, failure-safe function.
+    """
+    def decorator(func):
+        cached = _cache_data(ttl=ttl, show_spinner=False)(func)
 
+        @functools.wraps(func)
+        def wrapper():
+            return _call_or_default(cached, default_factory)
+        return wrapper
+    return decorator
+
+
+@_cached_lookup(ttl="5m", default_factory=dict)
 def get_summary_stats() -> Dict[str, Any]:
     """
     Get high-level summary statistics from order_summary view.
 
+    Cached for 5 minutes.
+
     Returns:
         Dictionary of summary statistics, or empty dict on error.
     """
-    query = "SELECT * FROM order_summary"
-    df = run_query(query)
+    return _fetch_row('q_summary')
+
+
+@_cached_lookup(ttl="1h", default_factory=dict)
+def get_filter_options() -> Dict[str, Any]:
+    """
+    Get the values that populate the dashboard filters in one query.
 
-    if df.empty:
+    Reads the single-row orders_catalog materialized view, which the seed
+    rebuilds after every load. Cached for an hour, as these only change
+    when the data is reseeded.
+
+    Returns:
+        Dictionary with 'categories', 'regions' and 'segments' lists and
+        'min_date'/'max_date' order date bounds, or empty dict on error.
+    """
+    # orders_catalog holds the DISTINCT/MIN/MAX results as one row of arrays
+    # and scalars; read it off the cursor, since psycopg2 already returns
+    # the arrays as Python lists
+    row = _fetch_row('q_filter_options')
+
+    if not row:
         return {}
 
-    return df.to_dict('records')[0]
+    return {
+        # array_agg returns NULL rather than an empty array on an empty table
+        'categories': row['categories'] or [],
+        'regions': row['regions'] or [],
+        'segments': row['segments'] or [],
+        'min_date': row['min_date'],
+        'max_date': row['max_date'],
+    }
 
 
 def get_categories() -> List[str]:
@@ -108,13 +392,7 @@ def get_categories() -> List[str]:
     Returns:
         List of category names.
     """
-    query = "SELECT DISTINCT category FROM orders ORDER BY category"
-    df = run_query(query)
-
-    if df.empty:
-        return []
-
-    return df['category'].tolist()
+    return get_filter_options().get('categories', [])
 
 
 def get_regions() -> List[str]:
@@ -124,29 +402,37 @@ def get_regions() -> List[str]:
     Returns:
         List of region names.
     """
-    query = "SELECT DISTINCT region FROM orders ORDER BY region"
-    df = run_query(query)
+    return get_filter_options().get('regions', [])
 
-    if df.empty:
-        return []
 
-    return df['region'].tolist()
+def get_date_range() -> Tuple[Optional[datetime], Optional[datetime]]:
+    """
+    Get min and max order dates from database.
+
+    Returns:
+        Tuple of (min_date, max_date) as datetime values, or (None, None)
+        if no data.
+    """
+    options = get_filter_options()
+    return options.get('min_date'), options.get('max_date')
 
 
-def get_date_range() -> Tuple[Optional[pd.Timestamp], Optional[pd.Timestamp]]:
+def get_years() -> List[int]:
     """
-    Get min and max order dates from database.
+    Get list of years covered by the orders data.
+
+    Derived from the MIN/MAX order date bounds instead of a DISTINCT scan
+    over every order, and shares the cached get_filter_options query.
 
     Returns:
-        Tuple of (min_date, max_date), or (None, None) if no data.
+        List of years in ascending order, or empty list if no data.
     """
-    query = "SELECT MIN(order_date) as min_date, MAX(order_date) as max_date FROM orders"
-    df = run_query(query)
+    min_date, max_date = get_date_range()
 
-    if df.empty:
-        return None, None
+    if pd.isna(min_date) or pd.isna(max_date):
+        return []
 
-    return df['min_date'].iloc[0], df['max_date'].iloc[0]
+    return list(range(min_date.year, max_date.year + 1))
 
 
 def get_segments() -> List[str]:
@@ -156,10 +442,32 @@ def get_segments() -> List[str]:
     Returns:
         List of segment names.
     """
-    query = "SELECT DISTINCT segment FROM orders ORDER BY segment"
-    df = run_query(query)
+    return get_filter_options().get('segments', [])
 
-    if df.empty:
-        return []
 
-    return df['segment'].tolist()
+def get_overview_rollup() -> pd.DataFrame:
+    """
+    Get order metrics by year and by customer segment in a single query.
+
+    Uses GROUPING SETS so both breakdowns come from one scan of the
+    orders_rollup materialized view. The 'level' column marks each row as a
+    'year' or 'segment' total.
+
+    Returns:
+        DataFrame with year, segment, level, orders, revenue, profit,
+        avg_margin and avg_order_value columns, or empty DataFrame on error.
+    """
+    query = """
+    SELECT
+        year,
+        segment,
+        CASE GROUPING(year, segment) WHEN 1 THEN 'year' ELSE 'segment' END as level,
+        SUM(orders) as orders,
+        SUM(revenue) as revenue,
+        SUM(profit) as profit,
+        SUM(margin_sum) / NULLIF(SUM(margin_count), 0) as avg_margin,
+        SUM(revenue) / SUM(orders) as avg_order_value
+    FROM orders_rollup
+    GROUP BY GROUPING SETS ((year), (segment))
+    """
+    return run_query(query)